@@ -5,9 +5,10 @@ A compiler for the Picolin programming language that generates bytecode
 for the stack-based virtual machine.
 """
 
+import math
 import re
 import struct
-from typing import List, Tuple, Optional
+from typing import List, NamedTuple, Tuple, Optional, Union
 
 # OpCode definitions (must match vm.h)
 OP_PUSH = 0
@@ -31,57 +32,98 @@ OP_INPUT = 17
 OP_SAVE_FILE = 18
 OP_LOAD_FILE = 19
 OP_HALT = 20
+OP_PUSH_0 = 21
+OP_PUSH_1 = 22
+OP_PUSH_INT8 = 23
+OP_NEG = 24
 
-# Token types
-TOKEN_NUMBER = 'NUMBER'
-TOKEN_IDENTIFIER = 'IDENTIFIER'
-TOKEN_ARROW = 'ARROW'  # <-
-TOKEN_PRINT = 'PRINT'
-TOKEN_PLUS = 'PLUS'
-TOKEN_MINUS = 'MINUS'
-TOKEN_MULTIPLY = 'MULTIPLY'
-TOKEN_DIVIDE = 'DIVIDE'
-TOKEN_LPAREN = 'LPAREN'
-TOKEN_RPAREN = 'RPAREN'
-TOKEN_LBRACKET = 'LBRACKET'  # [
-TOKEN_RBRACKET = 'RBRACKET'  # ]
-TOKEN_COMMA = 'COMMA'  # ,
-TOKEN_DOT = 'DOT'  # dot keyword
-TOKEN_RELU = 'RELU'  # relu keyword
-TOKEN_IF = 'IF'  # if keyword
-TOKEN_WHILE = 'WHILE'  # while keyword
-TOKEN_ELSE = 'ELSE'  # else keyword
-TOKEN_END = 'END'  # end keyword
-TOKEN_RAND = 'RAND'  # rand keyword
-TOKEN_INPUT = 'INPUT'  # input keyword
-TOKEN_SAVE = 'SAVE'  # save keyword
-TOKEN_LOAD = 'LOAD'  # load keyword
-TOKEN_GT = 'GT'  # >
-TOKEN_LT = 'LT'  # <
-TOKEN_EQ = 'EQ'  # ==
-TOKEN_EOF = 'EOF'
+# Precompiled operand formats: little-endian double (constants) and
+# little-endian int (variable indices, vector sizes, jump offsets)
+_D = struct.Struct('<d')
+_I = struct.Struct('<i')
+_PACK_D = _D.pack
+_PACK_I = _I.pack
+_PACKINTO_I = _I.pack_into
+
+# Token types (small ints: cheaper to compare than strings)
+TOKEN_NUMBER = 0
+TOKEN_IDENTIFIER = 1
+TOKEN_ARROW = 2  # <-
+TOKEN_PRINT = 3
+TOKEN_PLUS = 4
+TOKEN_MINUS = 5
+TOKEN_MULTIPLY = 6
+TOKEN_DIVIDE = 7
+TOKEN_LPAREN = 8
+TOKEN_RPAREN = 9
+TOKEN_LBRACKET = 10  # [
+TOKEN_RBRACKET = 11  # ]
+TOKEN_COMMA = 12  # ,
+TOKEN_DOT = 13  # dot keyword
+TOKEN_RELU = 14  # relu keyword
+TOKEN_IF = 15  # if keyword
+TOKEN_WHILE = 16  # while keyword
+TOKEN_ELSE = 17  # else keyword
+TOKEN_END = 18  # end keyword
+TOKEN_RAND = 19  # rand keyword
+TOKEN_INPUT = 20  # input keyword
+TOKEN_SAVE = 21  # save keyword
+TOKEN_LOAD = 22  # load keyword
+TOKEN_GT = 23  # >
+TOKEN_LT = 24  # <
+TOKEN_EQ = 25  # ==
+TOKEN_EOF = 26
+
+# Token type names, indexed by token type (for error messages)
+_TOKEN_NAMES = (
+    'NUMBER', 'IDENTIFIER', 'ARROW', 'PRINT', 'PLUS', 'MINUS',
+    'MULTIPLY', 'DIVIDE', 'LPAREN', 'RPAREN', 'LBRACKET', 'RBRACKET',
+    'COMMA', 'DOT', 'RELU', 'IF', 'WHILE', 'ELSE',
+    'END', 'RAND', 'INPUT', 'SAVE', 'LOAD', 'GT',
+    'LT', 'EQ', 'EOF',
+)
+
+# Token class bitmasks: `(1 << token_type) & MASK` is a single membership test
+_ADDITIVE_MASK = (1 << TOKEN_PLUS) | (1 << TOKEN_MINUS)
+_MULTIPLICATIVE_MASK = (1 << TOKEN_MULTIPLY) | (1 << TOKEN_DIVIDE) | (1 << TOKEN_DOT)
+_COMPARISON_MASK = (1 << TOKEN_GT) | (1 << TOKEN_LT) | (1 << TOKEN_EQ)
+_BLOCK_END_MASK = (1 << TOKEN_ELSE) | (1 << TOKEN_END) | (1 << TOKEN_EOF)
+
+# Binary operator token -> opcode
+_BINOP = {
+    TOKEN_PLUS: OP_ADD,
+    TOKEN_MINUS: OP_SUB,
+    TOKEN_MULTIPLY: OP_MUL,
+    TOKEN_DIVIDE: OP_DIV,
+    TOKEN_DOT: OP_DOT,
+    TOKEN_GT: OP_GT,
+    TOKEN_LT: OP_LT,
+    TOKEN_EQ: OP_EQ,
+}
+
+# Keywords: matched as identifiers, then reclassified by a table lookup
+_KEYWORDS = {
+    'print': TOKEN_PRINT,  # Print keyword (English)
+    'imprimir': TOKEN_PRINT,  # Print keyword (Spanish)
+    'dot': TOKEN_DOT,  # Dot product keyword
+    'relu': TOKEN_RELU,  # ReLU activation keyword
+    'if': TOKEN_IF,
+    'while': TOKEN_WHILE,
+    'else': TOKEN_ELSE,
+    'end': TOKEN_END,
+    'rand': TOKEN_RAND,
+    'input': TOKEN_INPUT,
+    'save': TOKEN_SAVE,
+    'load': TOKEN_LOAD,
+}
 
 # Token regex patterns
-# IMPORTANT: Keywords must come BEFORE TOKEN_IDENTIFIER to avoid ambiguity
 # IMPORTANT: NUMBER must come BEFORE TOKEN_MINUS to match negative numbers
 # IMPORTANT: == must come before = (if we add = later)
-# IMPORTANT: Keywords use word boundaries to avoid matching inside identifiers
 TOKEN_PATTERNS = [
     (TOKEN_NUMBER, r'-?\d+\.?\d*'),  # Numbers (integers and floats, optionally negative)
     (TOKEN_ARROW, r'<-'),  # Assignment arrow
-    (TOKEN_PRINT, r'\bprint\b'),  # Print keyword (English) - word boundary
-    (TOKEN_PRINT, r'\bimprimir\b'),  # Print keyword (Spanish) - word boundary
-    (TOKEN_DOT, r'\bdot\b'),  # Dot product keyword - word boundary
-    (TOKEN_RELU, r'\brelu\b'),  # ReLU activation keyword - word boundary
-    (TOKEN_IF, r'\bif\b'),  # if keyword - word boundary
-    (TOKEN_WHILE, r'\bwhile\b'),  # while keyword - word boundary
-    (TOKEN_ELSE, r'\belse\b'),  # else keyword - word boundary
-    (TOKEN_END, r'\bend\b'),  # end keyword - word boundary
-    (TOKEN_RAND, r'\brand\b'),  # rand keyword - word boundary
-    (TOKEN_INPUT, r'\binput\b'),  # input keyword - word boundary
-    (TOKEN_SAVE, r'\bsave\b'),  # save keyword - word boundary
-    (TOKEN_LOAD, r'\bload\b'),  # load keyword - word boundary
-    (TOKEN_IDENTIFIER, r'[a-zA-Z_][a-zA-Z0-9_]*'),  # Identifiers (must be after keywords)
+    (TOKEN_IDENTIFIER, r'[a-zA-Z_][a-zA-Z0-9_]*'),  # Identifiers and keywords (see _KEYWORDS)
     (TOKEN_PLUS, r'\+'),
     (TOKEN_MINUS, r'-'),  # Subtraction operator (only matches when not part of number)
     (TOKEN_MULTIPLY, r'\*'),
@@ -94,283 +136,303 @@ TOKEN_PATTERNS = [
     (TOKEN_LBRACKET, r'\['),  # Left bracket
     (TOKEN_RBRACKET, r'\]'),  # Right bracket
     (TOKEN_COMMA, r','),  # Comma
-    (r'\s+', None),  # Skip whitespace
 ]
 
 
-class Token:
-    def __init__(self, type: str, value: str, position: int):
-        self.type = type
-        self.value = value
-        self.position = position
-    
-    def __repr__(self):
-        return f"Token({self.type}, {self.value!r})"
+class Token(NamedTuple):
+    type: int
+    value: Union[str, float]
+    position: int
+
+
+def _token_action(token_type: int):
+    """Build a scanner callback that wraps a match in a Token."""
+    if token_type == TOKEN_NUMBER:
+        # Numeric literals are converted once here, not again by the parser
+        return lambda scanner, value: Token(token_type, float(value), scanner.match.start())
+    if token_type == TOKEN_IDENTIFIER:
+        return lambda scanner, value: Token(_KEYWORDS.get(value, TOKEN_IDENTIFIER), value,
+                                            scanner.match.start())
+    return lambda scanner, value: Token(token_type, value, scanner.match.start())
+
+
+# Comments run from '#' to the end of the line
+_COMMENT_RE = re.compile(r'#[^\n]*')
+
+# Compiled lexer: re.Scanner joins every pattern into one alternation in the
+# same order as TOKEN_PATTERNS and dispatches on the matching group in C.
+_SCANNER = re.Scanner(
+    [(pattern, _token_action(token_type)) for token_type, pattern in TOKEN_PATTERNS]
+    + [(r'\s+', None)]  # Skip whitespace
+)
 
 
 class Lexer:
+    __slots__ = ('source', 'position', 'tokens')
+    
     def __init__(self, source: str):
         # Remove comments (lines starting with # or # anywhere)
-        lines = source.split('\n')
-        cleaned_lines = []
-        for line in lines:
-            comment_pos = line.find('#')
-            if comment_pos >= 0:
-                line = line[:comment_pos]
-            cleaned_lines.append(line)
-        self.source = '\n'.join(cleaned_lines)
+        self.source = _COMMENT_RE.sub('', source)
         self.position = 0
         self.tokens = []
     
     def tokenize(self) -> List[Token]:
-        """Tokenize the source code using regex patterns."""
-        while self.position < len(self.source):
-            matched = False
-            
-            for item in TOKEN_PATTERNS:
-                # Handle both (token_type, pattern) and (pattern, None) formats
-                if len(item) == 2:
-                    if item[1] is None:
-                        # Format: (pattern, None) for whitespace
-                        pattern_str = item[0]
-                        token_type = None
-                    else:
-                        # Format: (token_type, pattern) for tokens
-                        token_type = item[0]
-                        pattern_str = item[1]
-                else:
-                    continue
-                
-                regex = re.compile(pattern_str)
-                match = regex.match(self.source, self.position)
-                
-                if match:
-                    matched = True
-                    value = match.group(0)
-                    
-                    if token_type:  # Skip whitespace (None type)
-                        # Keywords are already matched by their specific patterns above
-                        # This ensures 'print' and 'imprimir' are TOKEN_PRINT, not TOKEN_IDENTIFIER
-                        self.tokens.append(Token(token_type, value, self.position))
-                    
-                    self.position = match.end()
-                    break
-            
-            if not matched:
-                # Show context around error
-                start = max(0, self.position - 10)
-                end = min(len(self.source), self.position + 10)
-                context = self.source[start:end]
-                raise SyntaxError(f"Unexpected character '{self.source[self.position]}' at position {self.position}. Context: {repr(context)}")
+        """Tokenize the source code in a single pass of the compiled scanner."""
+        self.tokens, remainder = _SCANNER.scan(self.source)
+        self.position = len(self.source) - len(remainder)
+        
+        if self.position < len(self.source):
+            # Show context around error
+            start = max(0, self.position - 10)
+            end = min(len(self.source), self.position + 10)
+            context = self.source[start:end]
+            raise SyntaxError(f"Unexpected character '{self.source[self.position]}' at position {self.position}. Context: {repr(context)}")
         
         self.tokens.append(Token(TOKEN_EOF, '', self.position))
         return self.tokens
 
 
 class Parser:
+    # Fixed attribute layout: the parse_* methods read these on every token
+    __slots__ = ('types', 'values', 'positions', 'current', 'bytecode',
+                 'variables', 'var_indices')
+    
     def __init__(self, tokens: List[Token]):
-        self.tokens = tokens
+        # Token fields stored as parallel sequences (struct-of-arrays) so the
+        # hot lookahead checks index a single list instead of a Token object
+        self.types, self.values, self.positions = zip(*tokens)
         self.current = 0
-        self.bytecode = []
+        self.bytecode = bytearray()
         self.variables = {}  # Map variable names to indices
-        self.next_var_index = 0
+        # Resolve every identifier's variable index in one pass, in order of
+        # first appearance; non-identifier tokens get -1
+        variables = self.variables
+        self.var_indices = [
+            variables.setdefault(value, len(variables)) if token_type == TOKEN_IDENTIFIER else -1
+            for token_type, value in zip(self.types, self.values)
+        ]
     
-    def peek(self) -> Token:
-        """Look at current token without consuming it."""
-        if self.current >= len(self.tokens):
-            return self.tokens[-1]  # Return EOF
-        return self.tokens[self.current]
+    def peek_type(self) -> int:
+        """Look at current token type without consuming it."""
+        return self.types[self.current]
     
-    def advance(self) -> Token:
-        """Consume and return current token."""
-        if self.current < len(self.tokens):
-            self.current += 1
-        return self.tokens[self.current - 1]
+    def peek_position(self) -> int:
+        """Source position of the current token (for error messages)."""
+        return self.positions[self.current]
     
-    def get_var_index(self, name: str) -> int:
-        """Get or create variable index."""
-        if name not in self.variables:
-            self.variables[name] = self.next_var_index
-            self.next_var_index += 1
-        return self.variables[name]
+    def advance(self) -> int:
+        """Consume current token and return its type."""
+        # EOF is never consumed: every caller checks the type first
+        self.current += 1
+        return self.types[self.current - 1]
     
     def emit_byte(self, byte: int):
         """Emit a single byte."""
         self.bytecode.append(byte)
     
+    def emit_push(self, value: float):
+        """Emit the shortest push instruction for a constant."""
+        # Small integers use 1-2 byte short forms; -0.0 keeps the full
+        # double so it still prints as -0
+        if value.is_integer() and -128 <= value <= 127 and (value or math.copysign(1.0, value) > 0):
+            small = int(value)
+            if small == 0:
+                self.bytecode.append(OP_PUSH_0)
+            elif small == 1:
+                self.bytecode.append(OP_PUSH_1)
+            else:
+                self.bytecode.append(OP_PUSH_INT8)
+                self.bytecode.append(small & 0xFF)  # Two's complement int8
+            return
+        self.bytecode.append(OP_PUSH)
+        self.bytecode += _PACK_D(value)
+    
     def emit_double(self, value: float):
         """Emit a double value (8 bytes)."""
-        packed = struct.pack('<d', value)  # Little-endian double
-        self.bytecode.extend(packed)
+        self.bytecode += _PACK_D(value)  # Little-endian double
     
     def emit_int(self, value: int):
         """Emit an integer value (4 bytes)."""
-        packed = struct.pack('<i', value)  # Little-endian int
-        self.bytecode.extend(packed)
+        self.bytecode += _PACK_I(value)  # Little-endian int
     
     def patch_int(self, position: int, value: int):
         """Patch an integer value at a specific position in bytecode."""
-        packed = struct.pack('<i', value)
-        for i, byte in enumerate(packed):
-            self.bytecode[position + i] = byte
+        _PACKINTO_I(self.bytecode, position, value)
     
     def get_code_position(self) -> int:
         """Get current bytecode position."""
         return len(self.bytecode)
     
-    def parse_expression(self):
+    # The parse_* expression methods return the expression's value when it is
+    # a compile-time constant (its code is then a single push at the end of
+    # the bytecode), or None otherwise. Binary arithmetic on two constants is
+    # folded by replacing both pushes with one push of the result, and unary
+    # minus of a constant by pushing the negated value.
+    
+    def parse_expression(self) -> Optional[float]:
         """Parse expression with operator precedence (shunting yard algorithm)."""
         # Parse using recursive descent with precedence
         # Comparisons have lower precedence than arithmetic
         return self.parse_comparison()
     
-    def parse_additive(self):
+    def parse_additive(self) -> Optional[float]:
         """Parse addition and subtraction (lower precedence)."""
+        start = len(self.bytecode)
         left = self.parse_multiplicative()
         
-        while self.peek().type in (TOKEN_PLUS, TOKEN_MINUS):
-            op = self.advance()
+        while True:
+            # Read the lookahead once per iteration and consume it inline
+            op_type = self.types[self.current]
+            if not (1 << op_type) & _ADDITIVE_MASK:
+                break
+            self.current += 1
             right = self.parse_multiplicative()
             
-            if op.type == TOKEN_PLUS:
-                self.emit_byte(OP_ADD)
-            else:
-                self.emit_byte(OP_SUB)
+            if left is not None and right is not None:
+                left = left + right if op_type == TOKEN_PLUS else left - right
+                del self.bytecode[start:]
+                self.emit_push(left)
+                continue
+            
+            left = None
+            self.emit_byte(_BINOP[op_type])
         
         return left
     
-    def parse_multiplicative(self):
+    def parse_multiplicative(self) -> Optional[float]:
         """Parse multiplication, division, and dot product (higher precedence)."""
+        start = len(self.bytecode)
         left = self.parse_unary()
         
-        while self.peek().type in (TOKEN_MULTIPLY, TOKEN_DIVIDE, TOKEN_DOT):
-            op = self.advance()
+        while True:
+            op_type = self.types[self.current]
+            if not (1 << op_type) & _MULTIPLICATIVE_MASK:
+                break
+            self.current += 1
             right = self.parse_unary()
             
-            if op.type == TOKEN_MULTIPLY:
-                self.emit_byte(OP_MUL)
-            elif op.type == TOKEN_DIVIDE:
-                self.emit_byte(OP_DIV)
-            elif op.type == TOKEN_DOT:
-                self.emit_byte(OP_DOT)
+            # Division by zero is left to the VM, which reports it at run time
+            if left is not None and right is not None and (
+                    op_type == TOKEN_MULTIPLY or (op_type == TOKEN_DIVIDE and right != 0.0)):
+                left = left * right if op_type == TOKEN_MULTIPLY else left / right
+                del self.bytecode[start:]
+                self.emit_push(left)
+                continue
+            
+            left = None
+            self.emit_byte(_BINOP[op_type])
         
         return left
     
-    def parse_comparison(self):
+    def parse_comparison(self) -> Optional[float]:
         """Parse comparison operators (GT, LT, EQ) - lower precedence than arithmetic."""
         left = self.parse_additive()
         
-        while self.peek().type in (TOKEN_GT, TOKEN_LT, TOKEN_EQ):
-            op = self.advance()
-            right = self.parse_additive()
+        while True:
+            op_type = self.types[self.current]
+            if not (1 << op_type) & _COMPARISON_MASK:
+                break
+            self.current += 1
+            self.parse_additive()
             
-            if op.type == TOKEN_GT:
-                self.emit_byte(OP_GT)
-            elif op.type == TOKEN_LT:
-                self.emit_byte(OP_LT)
-            elif op.type == TOKEN_EQ:
-                self.emit_byte(OP_EQ)
+            left = None
+            self.emit_byte(_BINOP[op_type])
         
         return left
     
-    def parse_unary(self):
+    def parse_unary(self) -> Optional[float]:
         """Parse unary operators and primary expressions."""
-        if self.peek().type == TOKEN_RELU:
+        token_type = self.peek_type()
+        
+        if token_type == TOKEN_RELU:
             self.advance()  # Consume 'relu'
             self.parse_primary()
             self.emit_byte(OP_RELU)
-            return
+            return None
         
-        if self.peek().type == TOKEN_MINUS:
+        if token_type == TOKEN_MINUS:
             self.advance()
-            self.parse_primary()
-            # Emit negation: 0 - value
-            self.emit_byte(OP_PUSH)
-            self.emit_double(0.0)
-            self.emit_byte(OP_SUB)
-            return
+            start = len(self.bytecode)
+            value = self.parse_primary()
+            if value is not None:
+                del self.bytecode[start:]
+                self.emit_push(-value)
+                return -value
+            self.emit_byte(OP_NEG)
+            return None
         
         return self.parse_primary()
     
-    def parse_primary(self):
+    def parse_primary(self) -> Optional[float]:
         """Parse primary expressions (numbers, identifiers, parentheses, vectors, rand, input)."""
-        token = self.peek()
+        token_type = self.peek_type()
         
-        if token.type == TOKEN_NUMBER:
+        if token_type == TOKEN_NUMBER:
+            value = self.values[self.current]
             self.advance()
-            value = float(token.value)
-            self.emit_byte(OP_PUSH)
-            self.emit_double(value)
+            self.emit_push(value)
             return value
         
-        elif token.type == TOKEN_RAND:
+        elif token_type == TOKEN_RAND:
             self.advance()  # Consume 'rand'
             self.emit_byte(OP_RAND)
-            return None  # rand returns a value but we don't know it at compile time
         
-        elif token.type == TOKEN_INPUT:
+        elif token_type == TOKEN_INPUT:
             self.advance()  # Consume 'input'
             self.emit_byte(OP_INPUT)
-            return None  # input returns a value but we don't know it at compile time
         
-        elif token.type == TOKEN_IDENTIFIER:
+        elif token_type == TOKEN_IDENTIFIER:
+            var_index = self.var_indices[self.current]
             self.advance()
-            var_name = token.value
-            var_index = self.get_var_index(var_name)
             self.emit_byte(OP_LOAD)
             self.emit_int(var_index)
-            return var_name
         
-        elif token.type == TOKEN_LPAREN:
+        elif token_type == TOKEN_LPAREN:
             self.advance()  # Consume '('
-            result = self.parse_expression()
-            if self.peek().type != TOKEN_RPAREN:
-                raise SyntaxError(f"Expected ')' at position {self.peek().position}")
+            value = self.parse_expression()
+            if self.peek_type() != TOKEN_RPAREN:
+                raise SyntaxError(f"Expected ')' at position {self.peek_position()}")
             self.advance()  # Consume ')'
-            return result
+            return value
         
-        elif token.type == TOKEN_LBRACKET:
+        elif token_type == TOKEN_LBRACKET:
             # Vector literal: [expr1, expr2, ...]
             self.advance()  # Consume '['
-            elements = []
             
             # Check for empty vector
-            if self.peek().type == TOKEN_RBRACKET:
+            if self.peek_type() == TOKEN_RBRACKET:
                 self.advance()  # Consume ']'
                 # Empty vector - push size 0 and create vector
                 self.emit_byte(OP_VECTOR)
                 self.emit_int(0)
-                return []
+                return
             
             # Parse first element
             self.parse_expression()
-            elements.append(None)  # Placeholder
+            vector_size = 1
             
             # Parse remaining elements
-            while self.peek().type == TOKEN_COMMA:
+            while self.peek_type() == TOKEN_COMMA:
                 self.advance()  # Consume ','
                 self.parse_expression()
-                elements.append(None)  # Placeholder
+                vector_size += 1
             
-            if self.peek().type != TOKEN_RBRACKET:
-                raise SyntaxError(f"Expected ']' at position {self.peek().position}")
+            if self.peek_type() != TOKEN_RBRACKET:
+                raise SyntaxError(f"Expected ']' at position {self.peek_position()}")
             self.advance()  # Consume ']'
             
             # Emit OP_VECTOR with size
-            vector_size = len(elements)
             self.emit_byte(OP_VECTOR)
             self.emit_int(vector_size)
-            
-            return elements
         
         else:
-            raise SyntaxError(f"Unexpected token {token.type} at position {token.position}")
+            raise SyntaxError(f"Unexpected token {_TOKEN_NAMES[token_type]} at position {self.peek_position()}")
     
     def parse_statement(self):
         """Parse a statement."""
-        token = self.peek()
+        token_type = self.peek_type()
         
-        if token.type == TOKEN_WHILE:
+        if token_type == TOKEN_WHILE:
             # while condition ... end
             self.advance()  # Consume 'while'
             
@@ -386,9 +448,12 @@ class Parser:
             self.emit_int(0)  # Placeholder - will be patched
             
             # Parse loop body
-            while self.peek().type != TOKEN_END:
-                if self.peek().type == TOKEN_EOF:
-                    raise SyntaxError(f"Expected 'end' at position {self.peek().position}")
+            while True:
+                body_type = self.peek_type()
+                if body_type == TOKEN_END:
+                    break
+                if body_type == TOKEN_EOF:
+                    raise SyntaxError(f"Expected 'end' at position {self.peek_position()}")
                 self.parse_statement()
             
             # At end of loop body, emit unconditional jump back to loop start
@@ -409,11 +474,11 @@ class Parser:
             self.patch_int(jump_if_false_pos, offset_to_end)
             
             # Consume 'end'
-            if self.peek().type != TOKEN_END:
-                raise SyntaxError(f"Expected 'end' at position {self.peek().position}")
+            if self.peek_type() != TOKEN_END:
+                raise SyntaxError(f"Expected 'end' at position {self.peek_position()}")
             self.advance()
         
-        elif token.type == TOKEN_IF:
+        elif token_type == TOKEN_IF:
             # if condition ... else ... end
             self.advance()  # Consume 'if'
             
@@ -426,11 +491,11 @@ class Parser:
             self.emit_int(0)  # Placeholder - will be patched
             
             # Parse then block
-            while self.peek().type not in (TOKEN_ELSE, TOKEN_END, TOKEN_EOF):
+            while not (1 << self.types[self.current]) & _BLOCK_END_MASK:
                 self.parse_statement()
             
             # Check if there's an else block
-            has_else = self.peek().type == TOKEN_ELSE
+            has_else = self.peek_type() == TOKEN_ELSE
             
             if has_else:
                 # Emit jump to skip else block
@@ -447,11 +512,14 @@ class Parser:
                 self.advance()
                 
                 # Parse else block
-                while self.peek().type != TOKEN_END:
-                    if self.peek().type == TOKEN_EOF:
-                        raise SyntaxError(f"Expected 'end' at position {self.peek().position}")
-                    if self.peek().type == TOKEN_WHILE:
-                        raise SyntaxError(f"Unexpected 'while' inside else block at position {self.peek().position}")
+                while True:
+                    body_type = self.peek_type()
+                    if body_type == TOKEN_END:
+                        break
+                    if body_type == TOKEN_EOF:
+                        raise SyntaxError(f"Expected 'end' at position {self.peek_position()}")
+                    if body_type == TOKEN_WHILE:
+                        raise SyntaxError(f"Unexpected 'while' inside else block at position {self.peek_position()}")
                     self.parse_statement()
                 
                 # Patch the second jump (skip else block)
@@ -465,53 +533,48 @@ class Parser:
                 self.patch_int(jump_if_false_pos, offset_to_end)
             
             # Consume 'end'
-            if self.peek().type != TOKEN_END:
-                raise SyntaxError(f"Expected 'end' at position {self.peek().position}")
+            if self.peek_type() != TOKEN_END:
+                raise SyntaxError(f"Expected 'end' at position {self.peek_position()}")
             self.advance()
         
-        elif token.type == TOKEN_SAVE:
+        elif token_type == TOKEN_SAVE:
             # save - save memory state to disk
             self.advance()  # Consume 'save'
             self.emit_byte(OP_SAVE_FILE)
         
-        elif token.type == TOKEN_LOAD:
+        elif token_type == TOKEN_LOAD:
             # load - load memory state from disk
             self.advance()  # Consume 'load'
             self.emit_byte(OP_LOAD_FILE)
         
-        elif token.type == TOKEN_PRINT:
+        elif token_type == TOKEN_PRINT:
             # print/imprimir expression
             self.advance()  # Consume 'print' or 'imprimir'
             self.parse_expression()
             self.emit_byte(OP_PRINT)
         
-        elif token.type == TOKEN_IDENTIFIER:
-            # Check if this is actually a print statement with 'imprimir' that wasn't caught by lexer
-            # (defensive programming - should not happen if lexer is correct, but provides safety)
-            if token.value == 'imprimir' or token.value == 'print':
-                # This should not happen if lexer works correctly, but handle it gracefully
-                self.advance()  # Consume keyword
-                self.parse_expression()
-                self.emit_byte(OP_PRINT)
-            else:
-                # variable <- expression
-                var_name = self.advance().value
-                var_index = self.get_var_index(var_name)
-                
-                if self.peek().type != TOKEN_ARROW:
-                    raise SyntaxError(f"Expected '<-' after identifier '{var_name}' at position {self.peek().position}")
-                
-                self.advance()  # Consume '<-'
-                self.parse_expression()
-                self.emit_byte(OP_STORE)
-                self.emit_int(var_index)
+        elif token_type == TOKEN_IDENTIFIER:
+            # variable <- expression
+            var_name = self.values[self.current]
+            # Keywords (including 'print'/'imprimir') never reach here as identifiers
+            assert var_name not in _KEYWORDS
+            var_index = self.var_indices[self.current]
+            self.advance()
+            
+            if self.peek_type() != TOKEN_ARROW:
+                raise SyntaxError(f"Expected '<-' after identifier '{var_name}' at position {self.peek_position()}")
+            
+            self.advance()  # Consume '<-'
+            self.parse_expression()
+            self.emit_byte(OP_STORE)
+            self.emit_int(var_index)
         
         else:
-            raise SyntaxError(f"Unexpected token {token.type} at position {token.position}")
+            raise SyntaxError(f"Unexpected token {_TOKEN_NAMES[token_type]} at position {self.peek_position()}")
     
-    def parse(self) -> List[int]:
+    def parse(self) -> bytearray:
         """Parse the entire program."""
-        while self.peek().type != TOKEN_EOF:
+        while self.peek_type() != TOKEN_EOF:
             self.parse_statement()
         
         self.emit_byte(OP_HALT)
@@ -133,6 +133,22 @@ void vm_execute(VM* vm) {
                 break;
             }
             
+            case OP_PUSH_0: {
+                push(vm, 0.0);
+                break;
+            }
+            
+            case OP_PUSH_1: {
+                push(vm, 1.0);
+                break;
+            }
+            
+            case OP_PUSH_INT8: {
+                int8_t value = (int8_t)fetch_byte(vm);
+                push(vm, (double)value);
+                break;
+            }
+            
             case OP_ADD: {
                 double b = pop(vm);
                 double a = pop(vm);
@@ -147,6 +163,11 @@ void vm_execute(VM* vm) {
                 break;
             }
             
+            case OP_NEG: {
+                push(vm, -pop(vm));
+                break;
+            }
+            
             case OP_MUL: {
                 double b = pop(vm);
                 double a = pop(vm);
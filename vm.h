@@ -31,7 +31,11 @@ typedef enum {
     OP_INPUT,         // Read floating-point number from stdin and push
     OP_SAVE_FILE,     // Save memory array state to disk
     OP_LOAD_FILE,     // Load memory array state from disk
-    OP_HALT           // Halt execution
+    OP_HALT,          // Halt execution
+    OP_PUSH_0,        // Push 0.0 (short form of OP_PUSH)
+    OP_PUSH_1,        // Push 1.0 (short form of OP_PUSH)
+    OP_PUSH_INT8,     // Push signed 8-bit integer operand as a double
+    OP_NEG            // Negate top stack value
 } OpCode;
 
 // Vector metadata structure